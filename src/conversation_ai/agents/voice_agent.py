@@ -3,23 +3,38 @@ Main Voice Agent implementation using ottomator pattern.
 Orchestrates the STT-LLM-TTS pipeline for conversational AI.
 """
 
+import asyncio
 import logging
 import os
-from typing import Optional
+from typing import Optional, Set
 
+from google import genai
 from livekit import agents
-from livekit.agents import Agent, AgentSession, RunContext, room_io
-from livekit.agents.llm import function_tool
+from livekit.agents import (
+    Agent,
+    AgentSession,
+    ConversationItemAddedEvent,
+    RunContext,
+    room_io,
+)
+from livekit.agents.llm import ChatContext, ChatMessage, function_tool
 from livekit.plugins import silero
 
 from ..config.settings import settings
-from ..conversation.manager import conversation_manager
-from ..llm.gemini_llm import GeminiLLM
+from ..conversation.manager import ConversationSession, conversation_manager
+from ..http import register_shutdown
+from ..llm.gemini_llm import GeminiLLM, get_genai_client
 from ..stt.sarvam_stt import SarvamSTT
 from ..tts.sarvam_tts import SarvamTTS
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on each endpoint warmup, in seconds
+WARMUP_TIMEOUT = 5.0
+
+# Job-level tasks that nothing awaits; referenced here until they finish
+_background_tasks: Set[asyncio.Task] = set()
+
 
 class ConversationalAssistant(Agent):
     """
@@ -33,6 +48,8 @@ class ConversationalAssistant(Agent):
             instructions=conversation_manager._system_prompt
         )
         self.session_id: Optional[str] = None
+        # Bound once in on_enter so tools skip the manager lookup
+        self._conversation: Optional[ConversationSession] = None
         logger.info("Conversational Assistant initialized")
 
     async def on_enter(self):
@@ -42,8 +59,14 @@ class ConversationalAssistant(Agent):
         """
         # Create a new conversation session
         self.session_id = conversation_manager.create_session()
+        self._conversation = conversation_manager.get_session(self.session_id)
         logger.info(f"Created conversation session: {self.session_id}")
 
+        # Let the LLM reuse the session's prebuilt history for its requests
+        if isinstance(self.session.llm, GeminiLLM):
+            self.session.llm.bind_session(self._conversation)
+        self.session.on("conversation_item_added", self._on_conversation_item_added)
+
         # Generate initial greeting
         await self.session.generate_reply(
             instructions="Greet the user warmly and ask how you can help them today."
@@ -54,33 +77,52 @@ class ConversationalAssistant(Agent):
         Called when agent exits a session.
         Cleans up conversation session.
         """
+        self.session.off("conversation_item_added", self._on_conversation_item_added)
+        if isinstance(self.session.llm, GeminiLLM):
+            self.session.llm.bind_session(None)
+
         if self.session_id:
             logger.info(f"Ending conversation session: {self.session_id}")
             # Optionally clear the session
             # conversation_manager.clear_session(self.session_id)
 
+    async def on_user_turn_completed(
+        self, turn_ctx: ChatContext, new_message: ChatMessage
+    ) -> None:
+        """
+        Called when the user finishes speaking, before the LLM responds.
+        Records the user message in the conversation session.
+        """
+        # Recorded inline: the append is O(1) and the LLM request built right
+        # after this reads the session's prebuilt history
+        if self.session_id and new_message.text_content:
+            conversation_manager.add_user_message(
+                self.session_id, new_message.text_content
+            )
+
+    def _on_conversation_item_added(self, event: ConversationItemAddedEvent) -> None:
+        """Record assistant replies in the conversation session."""
+        item = event.item
+        if self.session_id and getattr(item, "role", None) == "assistant":
+            if item.text_content:
+                conversation_manager.add_assistant_message(
+                    self.session_id, item.text_content
+                )
+
     @function_tool
     async def get_conversation_summary(self, context: RunContext) -> str:
         """
         Get a summary of the current conversation.
         Useful for the agent to reference what has been discussed.
         """
-        if not self.session_id:
+        if self._conversation is None:
             return "No active conversation session."
 
-        session = conversation_manager.get_session(self.session_id)
-        if not session:
-            return "Session not found."
-
-        history = session.get_history()
-        if not history:
+        summary = self._conversation.get_recent_summary()
+        if not summary:
             return "No conversation history yet."
 
-        summary_parts = []
-        for turn in history[-5:]:  # Last 5 turns
-            summary_parts.append(f"{turn.role}: {turn.content[:100]}...")
-
-        return "Recent conversation:\n" + "\n".join(summary_parts)
+        return "Recent conversation:\n" + summary
 
     @function_tool
     async def remember_context(
@@ -96,11 +138,9 @@ class ConversationalAssistant(Agent):
             key: The key to store the context under
             value: The value to remember
         """
-        if self.session_id:
-            session = conversation_manager.get_session(self.session_id)
-            if session:
-                session.metadata[key] = value
-                return f"Remembered: {key} = {value}"
+        if self._conversation is not None:
+            self._conversation.metadata[key] = value
+            return f"Remembered: {key} = {value}"
         return "Could not save context."
 
     @function_tool
@@ -111,18 +151,68 @@ class ConversationalAssistant(Agent):
         Args:
             key: The key to recall
         """
-        if self.session_id:
-            session = conversation_manager.get_session(self.session_id)
-            if session and key in session.metadata:
-                return f"{key}: {session.metadata[key]}"
+        if self._conversation is not None and key in self._conversation.metadata:
+            return f"{key}: {self._conversation.metadata[key]}"
         return f"No context found for key: {key}"
 
 
+async def _warm_gemini(client: genai.Client) -> None:
+    """Issue a minimal Gemini request so the first turn avoids a cold start."""
+    try:
+        await asyncio.wait_for(
+            client.aio.models.generate_content(
+                model=settings.gemini_model,
+                contents=[{"role": "user", "parts": [{"text": "hi"}]}],
+                config={"max_output_tokens": 1},
+            ),
+            timeout=WARMUP_TIMEOUT,
+        )
+        logger.info("Gemini endpoint prewarmed")
+    except asyncio.TimeoutError:
+        logger.warning(f"Gemini prewarm timed out after {WARMUP_TIMEOUT}s")
+    except Exception as e:
+        logger.warning(f"Gemini prewarm failed: {e}")
+
+
+async def _warm_tts() -> None:
+    """Synthesize a tiny utterance so the first reply avoids a TTS cold start."""
+    tts = SarvamTTS(
+        language=settings.sarvam_tts_language,
+        speaker=settings.sarvam_tts_speaker,
+    )
+    try:
+        await asyncio.wait_for(
+            tts._synthesize_raw_audio("hi"), timeout=WARMUP_TIMEOUT
+        )
+        logger.info("Sarvam TTS endpoint prewarmed")
+    except asyncio.TimeoutError:
+        logger.warning(f"Sarvam TTS prewarm timed out after {WARMUP_TIMEOUT}s")
+    except Exception as e:
+        logger.warning(f"Sarvam TTS prewarm failed: {e}")
+
+
+async def _warm_endpoints(client: genai.Client) -> None:
+    """
+    Warm the remote LLM and TTS endpoints concurrently.
+
+    Runs on the job's event loop, so the connections it opens stay in the
+    pools the first turn uses.
+
+    Args:
+        client: Shared Gemini client used by the job's LLM
+    """
+    await asyncio.gather(_warm_gemini(client), _warm_tts())
+
+
 def prewarm(proc: agents.JobProcess):
     """
-    Prewarm function to initialize VAD model before processing.
+    Prewarm function to initialize VAD model and Gemini client before processing.
     This reduces latency on first voice detection.
+
+    Endpoint warmups run at the start of each job instead: HTTP clients are
+    bound to the event loop they connect on, and this function has none.
     """
+    proc.userdata["genai_client"] = get_genai_client(settings.gemini_api_key)
     proc.userdata["vad"] = silero.VAD.load()
     logger.info("VAD model prewarmed")
 
@@ -134,6 +224,17 @@ async def entrypoint(ctx: agents.JobContext):
     """
     logger.info(f"Starting agent for room: {ctx.room.name}")
 
+    # Release the shared Sarvam HTTP session when the job ends
+    register_shutdown(ctx)
+
+    # Warm the LLM and TTS endpoints while waiting for the participant
+    client = ctx.proc.userdata.get("genai_client") or get_genai_client(
+        settings.gemini_api_key
+    )
+    warm_task = asyncio.create_task(_warm_endpoints(client))
+    _background_tasks.add(warm_task)
+    warm_task.add_done_callback(_background_tasks.discard)
+
     # Connect to the room first
     await ctx.connect()
     logger.info("Connected to room")
@@ -144,7 +245,7 @@ async def entrypoint(ctx: agents.JobContext):
 
     # Initialize components
     stt = SarvamSTT(language="en-IN")
-    llm = GeminiLLM()
+    llm = GeminiLLM(client=client)
     tts = SarvamTTS(
         language=settings.sarvam_tts_language,
         speaker=settings.sarvam_tts_speaker,
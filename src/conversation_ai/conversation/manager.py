@@ -3,11 +3,13 @@ Conversation management for multi-turn dialogue.
 Handles context preservation, history tracking, and session management.
 """
 
+import heapq
 import logging
 import time
 from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from livekit.agents import llm
@@ -16,8 +18,35 @@ from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Minimum interval between expired-session sweeps, in seconds
+SWEEP_INTERVAL = 1.0
 
-@dataclass
+# Settings are fixed at runtime; read them once instead of per turn
+_MAX_HISTORY_TURNS = settings.max_conversation_history * 2  # user+assistant pairs
+_SESSION_TIMEOUT = settings.session_timeout
+
+# Number of recent turns kept preformatted for conversation summaries
+SUMMARY_TURNS = 5
+
+
+def gemini_content(role: str, text: str) -> dict:
+    """
+    Wrap a message in Gemini contents format.
+
+    Contents are kept to plain dict/list/str values (no dataclasses or SDK
+    objects) so request serialization stays on the JSON encoder's fast path.
+
+    Args:
+        role: Gemini role ("user" or "model")
+        text: Message text
+
+    Returns:
+        Content message in Gemini format
+    """
+    return {"role": role, "parts": [{"text": text}]}
+
+
+@dataclass(slots=True, frozen=True)
 class ConversationTurn:
     """Represents a single turn in the conversation."""
 
@@ -27,7 +56,7 @@ class ConversationTurn:
     metadata: Dict = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationSession:
     """Represents a conversation session with full context."""
 
@@ -36,6 +65,19 @@ class ConversationSession:
     created_at: float = field(default_factory=time.time)
     last_activity: float = field(default_factory=time.time)
     metadata: Dict = field(default_factory=dict)
+    _gemini_contents: deque = field(default_factory=deque, repr=False)
+    _contents_snapshot: Optional[List[dict]] = field(default=None, repr=False)
+    _recent_summary: deque = field(
+        default_factory=lambda: deque(maxlen=SUMMARY_TURNS), repr=False
+    )
+    # ChatContext built by ConversationManager.build_chat_context; extended in
+    # place per turn and dropped when the bounded history rotates
+    _chat_ctx: Optional[llm.ChatContext] = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        """Bound history to the configured number of user+assistant pairs."""
+        self.history = deque(self.history, maxlen=_MAX_HISTORY_TURNS)
+        self._gemini_contents = deque(self._gemini_contents, maxlen=_MAX_HISTORY_TURNS)
 
     def add_turn(self, role: str, content: str, metadata: Optional[Dict] = None) -> None:
         """
@@ -51,15 +93,24 @@ class ConversationSession:
             content=content,
             metadata=metadata or {},
         )
+        rotates = len(self.history) == self.history.maxlen
         self.history.append(turn)
         self.last_activity = time.time()
 
-        # Limit history size
-        max_history = settings.max_conversation_history
-        if len(self.history) > max_history * 2:  # Keep user+assistant pairs
-            # Remove oldest turns while keeping pairs
-            self.history.popleft()
-            self.history.popleft()
+        # Keep the Gemini-formatted history in step so it is never rebuilt per call
+        self._gemini_contents.append(
+            gemini_content("user" if role == "user" else "model", content)
+        )
+        self._contents_snapshot = None
+        self._recent_summary.append(f"{role}: {content[:100]}...")
+
+        if rotates:
+            self._chat_ctx = None
+        elif self._chat_ctx is not None:
+            self._chat_ctx.add_message(
+                role="user" if role == "user" else "assistant",
+                content=content,
+            )
 
         logger.debug(
             f"Session {self.session_id}: Added {role} turn, "
@@ -78,16 +129,43 @@ class ConversationSession:
         """
         if max_turns is None:
             return list(self.history)
-        return list(self.history)[-max_turns:]
+        size = len(self.history)
+        return list(islice(self.history, max(0, size - max_turns), size))
+
+    def get_gemini_contents(self) -> List[dict]:
+        """
+        Get the prebuilt history in Gemini contents format.
+
+        The list is cached until the next turn and passed to Gemini as is,
+        so callers must not modify it.
+
+        Returns:
+            List of content messages in Gemini format
+        """
+        if self._contents_snapshot is None:
+            self._contents_snapshot = list(self._gemini_contents)
+        return self._contents_snapshot
+
+    def get_recent_summary(self) -> str:
+        """
+        Get a short summary of the most recent turns.
+
+        Returns:
+            One line per recent turn, or an empty string if there is no history
+        """
+        return "\n".join(self._recent_summary)
 
     def is_expired(self) -> bool:
         """Check if session has expired based on inactivity."""
-        timeout = settings.session_timeout
-        return (time.time() - self.last_activity) > timeout
+        return (time.time() - self.last_activity) > _SESSION_TIMEOUT
 
     def clear_history(self) -> None:
         """Clear conversation history."""
         self.history.clear()
+        self._gemini_contents.clear()
+        self._contents_snapshot = None
+        self._recent_summary.clear()
+        self._chat_ctx = None
         logger.info(f"Session {self.session_id}: History cleared")
 
 
@@ -101,6 +179,11 @@ class ConversationManager:
         """Initialize conversation manager."""
         self._sessions: Dict[str, ConversationSession] = {}
         self._system_prompt = self._build_system_prompt()
+
+        # Lazy expiration: (expires_at, session_id) entries, swept periodically
+        self._timeout = _SESSION_TIMEOUT
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._last_sweep = 0.0
         logger.info("Conversation manager initialized")
 
     def _build_system_prompt(self) -> str:
@@ -142,6 +225,7 @@ Guidelines:
 
         session = ConversationSession(session_id=session_id)
         self._sessions[session_id] = session
+        self._touch(session)
 
         logger.info(f"Created new session: {session_id}")
         return session_id
@@ -156,15 +240,43 @@ Guidelines:
         Returns:
             ConversationSession or None if not found
         """
-        session = self._sessions.get(session_id)
+        return self._sessions.get(session_id)
 
-        # Check if session is expired
-        if session and session.is_expired():
-            logger.info(f"Session {session_id} expired, removing")
-            del self._sessions[session_id]
-            return None
+    def _touch(self, session: ConversationSession) -> None:
+        """
+        Schedule expiration for a session after activity.
 
-        return session
+        Args:
+            session: Session that was just active
+        """
+        now = session.last_activity
+        heapq.heappush(self._expiry_heap, (now + self._timeout, session.session_id))
+        if now - self._last_sweep >= SWEEP_INTERVAL:
+            self._sweep_expired(now)
+
+    def _sweep_expired(self, now: float) -> int:
+        """
+        Remove sessions whose expiration time has passed.
+
+        Heap entries made stale by later activity are discarded.
+
+        Args:
+            now: Current time
+
+        Returns:
+            Number of sessions removed
+        """
+        self._last_sweep = now
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, sid = heapq.heappop(heap)
+            session = self._sessions.get(sid)
+            if session and session.last_activity + self._timeout <= now:
+                self._sessions.pop(sid, None)
+                removed += 1
+                logger.info(f"Removed expired session: {sid}")
+        return removed
 
     def add_user_message(
         self, session_id: str, content: str, metadata: Optional[Dict] = None
@@ -180,6 +292,7 @@ Guidelines:
         session = self.get_session(session_id)
         if session:
             session.add_turn("user", content, metadata)
+            self._touch(session)
         else:
             logger.warning(f"Session {session_id} not found")
 
@@ -197,6 +310,7 @@ Guidelines:
         session = self.get_session(session_id)
         if session:
             session.add_turn("assistant", content, metadata)
+            self._touch(session)
         else:
             logger.warning(f"Session {session_id} not found")
 
@@ -204,12 +318,20 @@ Guidelines:
         """
         Build LiveKit ChatContext from session history.
 
+        The context is cached on the session and extended as turns are added,
+        so it is only rebuilt after the bounded history rotates. Callers get
+        their own copy of the cached context.
+
         Args:
             session_id: Session identifier
 
         Returns:
             ChatContext for LLM
         """
+        session = self.get_session(session_id)
+        if session is not None and session._chat_ctx is not None:
+            return session._chat_ctx.copy()
+
         chat_ctx = llm.ChatContext()
 
         # Add system prompt
@@ -219,14 +341,14 @@ Guidelines:
         )
 
         # Add conversation history
-        session = self.get_session(session_id)
         if session:
-            for turn in session.get_history():
-                role = "user" if turn.role == "user" else "assistant"
+            for turn in session.history:
                 chat_ctx.add_message(
-                    role=role,
+                    role="user" if turn.role == "user" else "assistant",
                     content=turn.content,
                 )
+            session._chat_ctx = chat_ctx
+            return chat_ctx.copy()
 
         return chat_ctx
 
@@ -237,8 +359,7 @@ Guidelines:
         Args:
             session_id: Session identifier
         """
-        if session_id in self._sessions:
-            del self._sessions[session_id]
+        if self._sessions.pop(session_id, None) is not None:
             logger.info(f"Cleared session: {session_id}")
 
     def cleanup_expired_sessions(self) -> int:
@@ -248,15 +369,7 @@ Guidelines:
         Returns:
             Number of sessions removed
         """
-        expired = [
-            sid for sid, session in self._sessions.items() if session.is_expired()
-        ]
-
-        for sid in expired:
-            del self._sessions[sid]
-            logger.info(f"Removed expired session: {sid}")
-
-        return len(expired)
+        return self._sweep_expired(time.time())
 
     def get_active_session_count(self) -> int:
         """Get count of active sessions."""
@@ -0,0 +1,142 @@
+"""
+Shared HTTP client for Sarvam AI API calls.
+Keeps one pooled aiohttp session per event loop so STT and TTS reuse connections,
+plus an optional HTTP/2 client when httpx and h2 are installed.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import aiohttp
+import orjson
+
+try:
+    import h2  # noqa: F401 - enables httpx's HTTP/2 support
+    import httpx
+except ImportError:  # HTTP/2 is optional: pip install "conversation-ai[http2]"
+    httpx = None
+
+if TYPE_CHECKING:
+    from livekit.agents import JobContext
+
+logger = logging.getLogger(__name__)
+
+# Connection pool limits for api.sarvam.ai
+CONNECTION_LIMIT = 64
+CONNECTION_LIMIT_PER_HOST = 32
+KEEPALIVE_TIMEOUT = 60
+DNS_CACHE_TTL = 300
+REQUEST_TIMEOUT = 30
+
+# Parses JSON response bodies straight from bytes; orjson skips the
+# stdlib's decode and string-assembly passes on large base64 fields
+json_loads: Callable[[bytes], Any] = orjson.loads
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+_session_users = 0
+_h2_client: Optional["httpx.AsyncClient"] = None
+_h2_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """
+    Get the process-wide aiohttp session for the running event loop.
+
+    The session is created lazily and recreated if it was closed or belongs
+    to a different event loop.
+
+    Returns:
+        Shared aiohttp ClientSession
+    """
+    global _session, _session_loop
+
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=CONNECTION_LIMIT,
+                limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+            ),
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+        )
+        _session_loop = loop
+        logger.debug("Created shared HTTP session")
+    return _session
+
+
+def get_h2_client() -> Optional["httpx.AsyncClient"]:
+    """
+    Get the process-wide HTTP/2 client for the running event loop.
+
+    Concurrent requests are multiplexed over one connection instead of
+    queueing for pooled HTTP/1.1 connections.
+
+    Returns:
+        Shared httpx AsyncClient, or None if httpx/h2 are not installed
+    """
+    global _h2_client, _h2_client_loop
+
+    if httpx is None:
+        return None
+
+    loop = asyncio.get_running_loop()
+    if _h2_client is None or _h2_client.is_closed or _h2_client_loop is not loop:
+        _h2_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=CONNECTION_LIMIT_PER_HOST,
+                max_keepalive_connections=CONNECTION_LIMIT_PER_HOST,
+                keepalive_expiry=KEEPALIVE_TIMEOUT,
+            ),
+            timeout=REQUEST_TIMEOUT,
+        )
+        _h2_client_loop = loop
+        logger.debug("Created shared HTTP/2 client")
+    return _h2_client
+
+
+async def close_shared_session() -> None:
+    """Close the shared aiohttp session and HTTP/2 client if they are open."""
+    global _session, _session_loop, _h2_client, _h2_client_loop
+
+    session = _session
+    _session = None
+    _session_loop = None
+    if session is not None and not session.closed:
+        await session.close()
+        logger.debug("Closed shared HTTP session")
+
+    client = _h2_client
+    _h2_client = None
+    _h2_client_loop = None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+        logger.debug("Closed shared HTTP/2 client")
+
+
+def register_shutdown(ctx: "JobContext") -> None:
+    """
+    Hold the shared session for a job and release it at job shutdown.
+
+    The session is closed once, when the last registered job shuts down,
+    so keep-alive connections survive while any job is still running.
+
+    Args:
+        ctx: LiveKit job context
+    """
+    global _session_users
+
+    _session_users += 1
+
+    async def _release() -> None:
+        global _session_users
+
+        _session_users -= 1
+        if _session_users == 0:
+            await close_shared_session()
+
+    ctx.add_shutdown_callback(_release)
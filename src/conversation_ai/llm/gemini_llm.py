@@ -4,16 +4,113 @@ Handles natural language understanding and response generation.
 """
 
 import logging
+import re
 import uuid
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from google import genai
 from livekit.agents import llm, APIConnectOptions
 
 from ..config.settings import settings
+from ..conversation.manager import (
+    ConversationSession,
+    conversation_manager,
+    gemini_content,
+)
 
 logger = logging.getLogger(__name__)
 
+# End of a sentence in streamed text: terminal punctuation (incl. Devanagari
+# danda) and optional closing quotes/brackets followed by whitespace, or a
+# line break. The end of the buffer is not a boundary: the next delta may
+# continue it (e.g. "3." + "14"); the remainder is flushed when the stream ends
+_SENTENCE_END_RE = re.compile(r'[.!?\u0964]["\')\]]*\s+|\n\s*')
+
+# Clients shared across GeminiLLM instances, keyed by API key
+_CLIENTS: Dict[str, genai.Client] = {}
+
+
+def get_genai_client(api_key: str) -> genai.Client:
+    """
+    Get the process-wide Gemini client for an API key.
+
+    Reusing one client keeps its connection pool warm across LLM instances.
+
+    Args:
+        api_key: Gemini API key
+
+    Returns:
+        Shared genai.Client
+    """
+    client = _CLIENTS.get(api_key)
+    if client is None:
+        client = _CLIENTS.setdefault(api_key, genai.Client(api_key=api_key))
+    return client
+
+
+# Chat roles mapped to Gemini roles; other roles are not sent as turns
+_GEMINI_ROLES = {"user": "user", "assistant": "model"}
+
+
+def _convert_message(item: llm.ChatMessage) -> Optional[dict]:
+    """Convert a user/assistant chat message to Gemini format."""
+    role = _GEMINI_ROLES.get(item.role)
+    if role is None:
+        return None
+    return gemini_content(role, item.text_content or "")
+
+
+# Chat item types that carry conversation text, dispatched by exact type
+_ITEM_HANDLERS: Dict[type, Callable[[Any], Optional[dict]]] = {
+    llm.ChatMessage: _convert_message,
+}
+
+
+def _build_contents(chat_ctx: llm.ChatContext) -> List[dict]:
+    """
+    Convert LiveKit ChatContext to Gemini contents format.
+
+    System messages are not sent as turns; see _find_system_instruction.
+
+    Args:
+        chat_ctx: LiveKit chat context
+
+    Returns:
+        List of content messages in Gemini format
+    """
+    contents = []
+
+    for item in chat_ctx.items:
+        handler = _ITEM_HANDLERS.get(type(item))
+        if handler is None:
+            continue
+
+        content = handler(item)
+        if content is not None:
+            contents.append(content)
+
+    return contents
+
+
+def _find_system_instruction(chat_ctx: llm.ChatContext) -> Optional[str]:
+    """
+    Get the agent instructions from a chat context.
+
+    LiveKit keeps the instructions, including updates made with
+    Agent.update_instructions, in a system message at the start of the
+    context, so the scan normally stops at the first item.
+
+    Args:
+        chat_ctx: LiveKit chat context
+
+    Returns:
+        Text of the first system message, or None if there is none
+    """
+    for item in chat_ctx.items:
+        if type(item) is llm.ChatMessage and item.role == "system":
+            return item.text_content
+    return None
+
 
 class GeminiLLM(llm.LLM):
     """
@@ -28,6 +125,7 @@ class GeminiLLM(llm.LLM):
         model: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        client: Optional[genai.Client] = None,
     ):
         """
         Initialize Gemini LLM client.
@@ -37,6 +135,7 @@ class GeminiLLM(llm.LLM):
             model: Model name (defaults to settings)
             temperature: Sampling temperature (defaults to settings)
             max_tokens: Maximum tokens in response (defaults to settings)
+            client: Existing Gemini client (defaults to the shared client)
         """
         super().__init__()
 
@@ -46,8 +145,15 @@ class GeminiLLM(llm.LLM):
         self._max_tokens = max_tokens or settings.gemini_max_tokens
         self._api_key = api_key or settings.gemini_api_key
 
-        # Initialize client with new API
-        self._client = genai.Client(api_key=self._api_key)
+        # Reuse a prewarmed or process-wide client
+        self._client = client or get_genai_client(self._api_key)
+
+        # System prompt is sent as Gemini's system instruction, not as a turn
+        self._system_instruction = conversation_manager._system_prompt
+
+        # Conversation session providing prebuilt contents. Bound by the agent
+        # in on_enter and unbound in on_exit, which owns the session.
+        self._session: Optional[ConversationSession] = None
 
         logger.info(f"Initialized Gemini LLM with model: {self._model_name}")
 
@@ -86,55 +192,18 @@ class GeminiLLM(llm.LLM):
             model_name=self._model_name,
             temperature=self._temperature,
             max_tokens=self._max_tokens,
+            system_instruction=self._system_instruction,
             client=self._client,
         )
 
-    def _build_contents(self, chat_ctx: llm.ChatContext) -> List[dict]:
+    def bind_session(self, session: Optional[ConversationSession]) -> None:
         """
-        Convert LiveKit ChatContext to Gemini contents format.
+        Bind a conversation session whose prebuilt history is used for requests.
 
         Args:
-            chat_ctx: LiveKit chat context
-
-        Returns:
-            List of content messages in Gemini format
+            session: Conversation session (None to unbind)
         """
-        contents = []
-        system_instruction = None
-
-        for item in chat_ctx.items:
-            if not hasattr(item, 'role'):
-                continue
-
-            content = item.content if isinstance(item.content, str) else str(item.content)
-
-            if item.role == "system":
-                system_instruction = content
-            elif item.role == "user":
-                contents.append({
-                    "role": "user",
-                    "parts": [{"text": content}]
-                })
-            elif item.role == "assistant":
-                contents.append({
-                    "role": "model",
-                    "parts": [{"text": content}]
-                })
-
-        # Prepend system instruction as first user message if it exists
-        if system_instruction:
-            if contents:
-                contents.insert(0, {
-                    "role": "user",
-                    "parts": [{"text": f"System instructions: {system_instruction}"}]
-                })
-            else:
-                contents.append({
-                    "role": "user",
-                    "parts": [{"text": f"System instructions: {system_instruction}"}]
-                })
-
-        return contents
+        self._session = session
 
 
 class GeminiLLMStream(llm.LLMStream):
@@ -153,6 +222,7 @@ class GeminiLLMStream(llm.LLMStream):
         model_name: str,
         temperature: float,
         max_tokens: int,
+        system_instruction: str,
         client: genai.Client,
     ):
         """
@@ -167,79 +237,105 @@ class GeminiLLMStream(llm.LLMStream):
         self._model_name = model_name
         self._temperature = temperature
         self._max_tokens = max_tokens
+        self._system_instruction = system_instruction
         self._client = client
         self._response_text = None
 
-    def _build_contents(self) -> List[dict]:
-        """Build contents from chat context."""
-        contents = []
-        system_instruction = None
-
-        for item in self._chat_ctx.items:
-            if not hasattr(item, 'role'):
-                continue
-
-            content = item.content if isinstance(item.content, str) else str(item.content)
-
-            if item.role == "system":
-                system_instruction = content
-            elif item.role == "user":
-                contents.append({
-                    "role": "user",
-                    "parts": [{"text": content}]
-                })
-            elif item.role == "assistant":
-                contents.append({
-                    "role": "model",
-                    "parts": [{"text": content}]
-                })
-
-        if system_instruction:
-            if contents:
-                contents.insert(0, {
-                    "role": "user",
-                    "parts": [{"text": f"System instructions: {system_instruction}"}]
-                })
-            else:
-                contents.append({
-                    "role": "user",
-                    "parts": [{"text": f"System instructions: {system_instruction}"}]
-                })
-
-        return contents
+        # Chunk IDs only need to be unique within this stream
+        self._stream_id = uuid.uuid4().hex
+        self._chunk_seq = 0
+
+    def _build_contents(self) -> Tuple[List[dict], str]:
+        """
+        Build contents and system instruction for the request.
+
+        Uses the bound session's prebuilt history when it is in step with the
+        chat context, otherwise converts the chat context. Either way the
+        system instruction comes from the chat context, so instruction updates
+        (and per-reply instructions, e.g. for the greeting) apply to every
+        turn; the prompt captured at startup is only a fallback.
+        """
+        system_instruction = (
+            _find_system_instruction(self._chat_ctx) or self._system_instruction
+        )
+
+        session = self._llm._session
+        if session is not None:
+            contents = session.get_gemini_contents()
+            items = self._chat_ctx.items
+            last = items[-1] if items else None
+            if (
+                contents
+                and getattr(last, "role", None) == "user"
+                and contents[-1]["parts"][0]["text"] == last.text_content
+            ):
+                return contents, system_instruction
+
+        contents = _build_contents(self._chat_ctx)
+        if not contents:
+            # Gemini requires at least one turn
+            contents.append(gemini_content("user", "."))
+        return contents, system_instruction
+
+    def _send_chunk(self, text: str) -> None:
+        """
+        Emit text as a chat chunk.
+
+        Args:
+            text: Response text to emit
+        """
+        chunk = llm.ChatChunk(
+            id=f"{self._stream_id}-{self._chunk_seq}",
+            delta=llm.ChoiceDelta(
+                role="assistant",
+                content=text,
+            )
+        )
+        self._event_ch.send_nowait(chunk)
+        self._chunk_seq += 1
 
     async def _run(self):
         """
-        Run the LLM inference and emit chunks.
+        Run the LLM inference and emit chunks as they are generated.
         """
         try:
-            contents = self._build_contents()
+            contents, system_instruction = self._build_contents()
             logger.debug(f"Sending {len(contents)} messages to Gemini")
 
-            # Generate response using Gemini API
-            response = await self._client.aio.models.generate_content(
+            # Stream the response so TTS can start on the first sentence
+            stream = await self._client.aio.models.generate_content_stream(
                 model=self._model_name,
                 contents=contents,
                 config={
                     "temperature": self._temperature,
                     "max_output_tokens": self._max_tokens,
+                    "system_instruction": system_instruction,
                 }
             )
 
-            self._response_text = response.text
+            # Forward text at sentence boundaries so TTS is not fed per token
+            response_parts = []
+            pending = ""
+            async for response in stream:
+                text = response.text
+                if not text:
+                    continue
+                response_parts.append(text)
+
+                pending += text
+                boundary = 0
+                for match in _SENTENCE_END_RE.finditer(pending):
+                    boundary = match.end()
+                if boundary:
+                    self._send_chunk(pending[:boundary])
+                    pending = pending[boundary:]
+
+            if pending:
+                self._send_chunk(pending)
+
+            self._response_text = "".join(response_parts)
             logger.debug(f"Gemini response: {self._response_text[:100]}...")
 
-            # Emit the response as a chat chunk
-            chunk = llm.ChatChunk(
-                id=str(uuid.uuid4()),
-                delta=llm.ChoiceDelta(
-                    role="assistant",
-                    content=self._response_text,
-                )
-            )
-
-            self._event_ch.send_nowait(chunk)
-
         except Exception as e:
             logger.error(f"Error in Gemini chat generation: {e}", exc_info=True)
             raise
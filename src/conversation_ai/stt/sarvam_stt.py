@@ -5,15 +5,146 @@ Implements custom STT node using Sarvam AI's API.
 
 import asyncio
 import logging
-from typing import Optional
+import operator
+import struct
+import uuid
+from functools import lru_cache
+from typing import Optional, Tuple
 
 import aiohttp
+import numpy as np
+from livekit import rtc
 from livekit.agents import stt, utils, APIConnectOptions
 
 from ..config.settings import settings
+from ..http import get_shared_session, json_loads
 
 logger = logging.getLogger(__name__)
 
+# 44-byte mono 16-bit PCM WAV header; sizes and sample rate are patched per call
+_WAV_HEADER_TEMPLATE = (
+    b'RIFF' + b'\x00' * 4 + b'WAVE'  # RIFF chunk (ChunkSize at offset 4)
+    + b'fmt ' + struct.pack(
+        '<IHHIIHH',
+        16,  # Subchunk1Size (16 for PCM)
+        1,   # AudioFormat (1 for PCM)
+        1,   # NumChannels (1 for mono)
+        0,   # SampleRate (offset 24)
+        0,   # ByteRate (offset 28)
+        2,   # BlockAlign (NumChannels * BitsPerSample/8)
+        16,  # BitsPerSample (16)
+    )
+    + b'data' + b'\x00' * 4  # data chunk (Subchunk2Size at offset 40)
+)
+
+
+# Length of the anti-alias filter, in output samples
+LOWPASS_ZERO_CROSSINGS = 16
+
+
+@lru_cache(maxsize=8)
+def _lowpass_kernel(cutoff: float) -> np.ndarray:
+    """
+    Build a windowed-sinc low-pass FIR filter.
+
+    Args:
+        cutoff: Cutoff as a fraction of the input Nyquist rate (0 to 1)
+
+    Returns:
+        Filter taps normalized to unity gain
+    """
+    num_taps = 2 * int(LOWPASS_ZERO_CROSSINGS / cutoff) + 1
+    n = np.arange(num_taps) - num_taps // 2
+    kernel = np.sinc(cutoff * n) * np.blackman(num_taps)
+    return kernel / kernel.sum()
+
+
+def _to_int16_pcm(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """
+    Resample mono audio and quantize it to 16-bit PCM.
+
+    Downsampling low-pass filters the input first to avoid aliasing.
+
+    Args:
+        samples: Mono samples, either int16 or float in [-1.0, 1.0]
+        src_rate: Sample rate of the input in Hz
+        dst_rate: Target sample rate in Hz
+
+    Returns:
+        Little-endian int16 samples at dst_rate
+    """
+    if samples.dtype.kind == 'f':
+        samples = samples * 32767
+    if dst_rate < src_rate and len(samples):
+        # Remove content above the target Nyquist rate so it does not alias
+        kernel = _lowpass_kernel(dst_rate / src_rate)
+        delay = len(kernel) // 2
+        # Full convolution trimmed by the filter delay keeps the input length
+        # even when the buffer is shorter than the kernel
+        samples = np.convolve(samples, kernel)[delay:delay + len(samples)]
+    if src_rate != dst_rate and len(samples):
+        # Linear interpolation at the target sample positions
+        num_out = round(len(samples) * dst_rate / src_rate)
+        positions = np.arange(num_out) * (src_rate / dst_rate)
+        samples = np.interp(positions, np.arange(len(samples)), samples)
+    return samples.clip(-32768, 32767).astype('<i2')
+
+
+class MultipartAudioPayload(aiohttp.payload.Payload):
+    """
+    multipart/form-data upload body built from prebuilt byte segments.
+    Writes the leading parts and headers, the PCM samples, then the closing
+    boundary, so neither FormData nor a joined copy of the audio is needed.
+    """
+
+    _autoclose = True  # Only holds in-memory buffers
+
+    def __init__(self, head: bytes, pcm_data: memoryview, tail: bytes, boundary: str, **kwargs):
+        """
+        Initialize the payload.
+
+        Args:
+            head: Bytes written before the samples (fields, part headers, WAV header)
+            pcm_data: Raw PCM samples as a byte view
+            tail: Bytes written after the samples (closing boundary)
+            boundary: Multipart boundary used in head and tail
+        """
+        super().__init__(
+            pcm_data,
+            content_type=f'multipart/form-data; boundary={boundary}',
+            **kwargs,
+        )
+        self._head = head
+        self._tail = tail
+        self._size = len(head) + pcm_data.nbytes + len(tail)
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        """Return string representation of the multipart body."""
+        return (self._head + self._value.tobytes() + self._tail).decode(encoding, errors)
+
+    async def as_bytes(self, encoding: str = "utf-8", errors: str = "strict") -> bytes:
+        """Return the multipart body as bytes."""
+        return self._head + self._value.tobytes() + self._tail
+
+    async def write(self, writer) -> None:
+        """Write the head, PCM samples and tail to the writer stream."""
+        await writer.write(self._head)
+        await writer.write(self._value)
+        await writer.write(self._tail)
+
+    async def write_with_length(self, writer, content_length: Optional[int]) -> None:
+        """Write at most content_length bytes of the multipart body."""
+        if content_length is None:
+            await self.write(writer)
+            return
+        remaining = content_length
+        for segment in (self._head, self._value, self._tail):
+            if remaining <= 0:
+                break
+            chunk = segment[:remaining]
+            await writer.write(chunk)
+            remaining -= len(chunk)
+
 
 class SarvamSTT(stt.STT):
     """
@@ -28,6 +159,7 @@ class SarvamSTT(stt.STT):
         api_url: Optional[str] = None,
         language: str = "hi-IN",  # Default to Hindi, can be changed
         sample_rate: int = 16000,
+        raw_pcm_upload: bool = False,
     ):
         """
         Initialize Sarvam STT client.
@@ -37,6 +169,8 @@ class SarvamSTT(stt.STT):
             api_url: Sarvam STT endpoint URL (defaults to settings)
             language: Language code for recognition (e.g., 'hi-IN', 'en-IN')
             sample_rate: Audio sample rate in Hz
+            raw_pcm_upload: Upload raw 16-bit PCM instead of WAV, for endpoints
+                that accept it (WAV is the default)
         """
         super().__init__(
             capabilities=stt.STTCapabilities(streaming=False, interim_results=False)
@@ -45,39 +179,92 @@ class SarvamSTT(stt.STT):
         self._api_url = api_url or settings.sarvam_stt_url
         self._language = language
         self._sample_rate = sample_rate
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._raw_pcm_upload = raw_pcm_upload
+
+        # Multipart framing reused by every request; the language_code part is
+        # cached for the last language used and rebuilt when it changes
+        self._boundary = uuid.uuid4().hex
+        self._multipart_tail = f'\r\n--{self._boundary}--\r\n'.encode()
+        self._language_part: Tuple[str, bytes] = (
+            language, self._build_language_part(language)
+        )
+
+        # Resolve the buffer sample rate once per instance: read it straight
+        # off the frame when AudioFrame exposes it, otherwise use the default
+        if hasattr(rtc.AudioFrame, 'sample_rate'):
+            self._get_sample_rate = operator.attrgetter('sample_rate')
+        else:
+            self._get_sample_rate = lambda buffer: self._sample_rate
 
     async def _ensure_session(self) -> aiohttp.ClientSession:
-        """Ensure aiohttp session is initialized."""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
-
-    def _create_wav_header(self, pcm_data: bytes, sample_rate: int) -> bytes:
-        """Create a WAV header for the PCM data."""
-        import struct
-        
-        # WAV Header format
-        # RIFF chunk
-        header = b'RIFF'
-        header += struct.pack('<I', 36 + len(pcm_data))  # ChunkSize
-        header += b'WAVE'
-        
-        # fmt chunk
-        header += b'fmt '
-        header += struct.pack('<I', 16)  # Subchunk1Size (16 for PCM)
-        header += struct.pack('<H', 1)   # AudioFormat (1 for PCM)
-        header += struct.pack('<H', 1)   # NumChannels (1 for mono)
-        header += struct.pack('<I', sample_rate)  # SampleRate
-        header += struct.pack('<I', sample_rate * 2)  # ByteRate (SampleRate * NumChannels * BitsPerSample/8)
-        header += struct.pack('<H', 2)   # BlockAlign (NumChannels * BitsPerSample/8)
-        header += struct.pack('<H', 16)  # BitsPerSample (16)
-        
-        # data chunk
-        header += b'data'
-        header += struct.pack('<I', len(pcm_data))  # Subchunk2Size
-        
-        return header + pcm_data
+        """Get the shared aiohttp session (pooled with the other Sarvam client)."""
+        return get_shared_session()
+
+    async def aclose(self) -> None:
+        """Clean up resources. The shared session is closed at job shutdown."""
+
+    def _build_language_part(self, language: str) -> bytes:
+        """Build the complete language_code form part, including its boundary."""
+        return (
+            f'--{self._boundary}\r\n'
+            f'Content-Disposition: form-data; name="language_code"\r\n\r\n'
+            f'{language}\r\n'
+        ).encode()
+
+    def _get_language_part(self, language: str) -> bytes:
+        """Get the language_code form part, rebuilding it if the language changed."""
+        if language != self._language_part[0]:
+            self._language_part = (language, self._build_language_part(language))
+        return self._language_part[1]
+
+    def _create_file_part_header(self, filename: str, content_type: str) -> bytes:
+        """Build the boundary and headers that open the file form part."""
+        return (
+            f'--{self._boundary}\r\n'
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'
+        ).encode()
+
+    def _create_wav_header(self, pcm_size: int, sample_rate: int) -> bytes:
+        """Create a WAV header for PCM data of the given size in bytes."""
+        header = bytearray(_WAV_HEADER_TEMPLATE)
+        struct.pack_into('<I', header, 4, 36 + pcm_size)  # ChunkSize
+        struct.pack_into('<I', header, 24, sample_rate)  # SampleRate
+        struct.pack_into('<I', header, 28, sample_rate * 2)  # ByteRate
+        struct.pack_into('<I', header, 40, pcm_size)  # Subchunk2Size
+        return bytes(header)
+
+    def _build_upload(
+        self, pcm_data: memoryview, sample_rate: int, language: str
+    ) -> MultipartAudioPayload:
+        """
+        Build the multipart body for the Sarvam STT API.
+
+        Args:
+            pcm_data: Raw 16-bit mono PCM samples as a byte view
+            sample_rate: Sample rate of the PCM data in Hz
+            language: Language code sent in the language_code field
+
+        Returns:
+            Payload with the language_code field followed by the audio file
+        """
+        if self._raw_pcm_upload:
+            # Send the captured samples as is, described by the content type
+            file_header = self._create_file_part_header(
+                'audio.pcm', f'audio/L16; rate={sample_rate}; channels=1'
+            )
+        else:
+            # Add WAV header (required by Sarvam API); written ahead of the PCM
+            file_header = self._create_file_part_header(
+                'audio.wav', 'audio/wav'
+            ) + self._create_wav_header(pcm_data.nbytes, sample_rate)
+
+        return MultipartAudioPayload(
+            self._get_language_part(language) + file_header,
+            pcm_data,
+            self._multipart_tail,
+            self._boundary,
+        )
 
     async def _recognize_impl(
         self,
@@ -100,40 +287,43 @@ class SarvamSTT(stt.STT):
         try:
             session = await self._ensure_session()
 
-            # Convert audio buffer to bytes (raw PCM)
-            pcm_data = buffer.data.tobytes()
+            # View the raw PCM samples as bytes without copying
+            pcm_data = memoryview(buffer.data).cast('B')
             
             # Determine sample rate from buffer if available, otherwise use default
-            current_sample_rate = getattr(buffer, 'sample_rate', self._sample_rate)
-            
-            # Add WAV header (required by Sarvam API)
-            audio_data = self._create_wav_header(pcm_data, current_sample_rate)
+            current_sample_rate = self._get_sample_rate(buffer)
 
+            if current_sample_rate != self._sample_rate:
+                # Resample to the configured rate in one vectorized pass
+                pcm_data = memoryview(
+                    _to_int16_pcm(
+                        np.frombuffer(pcm_data, dtype='<i2'),
+                        current_sample_rate,
+                        self._sample_rate,
+                    )
+                ).cast('B')
+                current_sample_rate = self._sample_rate
+            
             # Prepare request - Sarvam uses api-subscription-key header
             headers = {
                 "api-subscription-key": self._api_key,
             }
 
-            # Prepare form data for Sarvam STT API
-            form_data = aiohttp.FormData()
-            form_data.add_field(
-                'file',
-                audio_data,
-                filename='audio.wav',
-                content_type='audio/wav'
+            audio_data = self._build_upload(
+                pcm_data, current_sample_rate, language or self._language
             )
-            form_data.add_field('language_code', language or self._language)
 
             # Make API request to Sarvam AI
             logger.debug(
-                f"Sending audio to Sarvam STT (size: {len(audio_data)} bytes, sample_rate: {current_sample_rate})"
+                "Sending audio to Sarvam STT (size: %d bytes, sample_rate: %d)",
+                audio_data.size,
+                current_sample_rate,
             )
 
             async with session.post(
                 self._api_url,
                 headers=headers,
-                data=form_data,
-                timeout=aiohttp.ClientTimeout(total=30),
+                data=audio_data,
             ) as response:
                 if response.status != 200:
                     error_text = await response.text()
@@ -151,8 +341,9 @@ class SarvamSTT(stt.STT):
                         ],
                     )
 
-                result = await response.json()
-                logger.debug(f"Sarvam STT response: {result}")
+                result = json_loads(await response.read())
+                # Log the shape only; formatting the whole response is costly
+                logger.debug("Sarvam STT response keys: %s", list(result))
 
                 # Extract transcript from response
                 # Adjust based on actual Sarvam API response structure
@@ -194,8 +385,3 @@ class SarvamSTT(stt.STT):
                     )
                 ],
             )
-
-    async def aclose(self) -> None:
-        """Clean up resources."""
-        if self._session and not self._session.closed:
-            await self._session.close()
@@ -4,17 +4,105 @@ Implements custom TTS using Sarvam AI's Bulbul v2 API.
 """
 
 import asyncio
-import base64
+import binascii
 import logging
-from typing import Optional
+import re
+import struct
+from collections import deque
+from itertools import islice
+from typing import List, Optional, Tuple
 
 import aiohttp
 from livekit.agents import tts, APIConnectOptions
 
 from ..config.settings import settings
+from ..http import (
+    CONNECTION_LIMIT_PER_HOST,
+    get_h2_client,
+    get_shared_session,
+    json_loads,
+)
 
 logger = logging.getLogger(__name__)
 
+# Cap on in-flight Sarvam TTS requests per process, matching the shared
+# connector's per-host limit so excess requests wait here, not in the pool
+MAX_CONCURRENT_REQUESTS = CONNECTION_LIMIT_PER_HOST
+
+# Duration of each PCM chunk pushed to the audio emitter
+PUSH_CHUNK_MS = 100
+
+# Sentences synthesized ahead of the one being pushed to the emitter
+MAX_PREFETCH = 2
+
+# End of a sentence: terminal punctuation (incl. Devanagari danda) and optional
+# closing quotes/brackets, then the whitespace separating it from the next one
+_SENTENCE_END_RE = re.compile(r'([.!?\u0964]["\')\]]*)\s+')
+
+_request_semaphore: Optional[asyncio.Semaphore] = None
+_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences for incremental synthesis.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Non-empty sentences in order, or [text] if there are none
+    """
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        sentences.append(text[start:match.end(1)])
+        start = match.end()
+    if start < len(text):
+        sentences.append(text[start:])
+    return sentences or [text]
+
+
+def _get_request_semaphore() -> asyncio.Semaphore:
+    """Get the process-wide TTS request semaphore for the running event loop."""
+    global _request_semaphore, _semaphore_loop
+
+    loop = asyncio.get_running_loop()
+    if _request_semaphore is None or _semaphore_loop is not loop:
+        _request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        _semaphore_loop = loop
+    return _request_semaphore
+
+
+def _clamp(value: float, lo: float, hi: float) -> float:
+    """Clamp a value to the inclusive range [lo, hi]."""
+    return lo if value < lo else hi if value > hi else value
+
+
+def _find_wav_data(audio_data: bytes) -> Tuple[int, int]:
+    """
+    Locate the PCM samples in a WAV file by walking its RIFF chunks.
+
+    Args:
+        audio_data: Complete WAV file contents
+
+    Returns:
+        Tuple of (offset, length) of the data chunk payload
+    """
+    if audio_data[:4] != b'RIFF' or audio_data[8:12] != b'WAVE':
+        raise ValueError("Sarvam TTS audio is not a WAV file")
+
+    offset = 12
+    while offset + 8 <= len(audio_data):
+        tag, size = struct.unpack_from('<4sI', audio_data, offset)
+        offset += 8
+        if tag == b'data':
+            # Streamed WAVs may carry a placeholder size; clamp to what we have
+            return offset, min(size, len(audio_data) - offset)
+        offset += size + (size & 1)  # Chunks are word-aligned
+
+    raise ValueError("Sarvam TTS audio has no WAV data chunk")
+
 
 class SarvamChunkedStream(tts.ChunkedStream):
     """Custom ChunkedStream implementation for Sarvam TTS."""
@@ -39,21 +127,44 @@ class SarvamChunkedStream(tts.ChunkedStream):
         Args:
             output_emitter: AudioEmitter from the base class (managed by framework)
         """
+        # Synthesize sentence by sentence so the first one plays while the
+        # next ones are still being synthesized
+        sentences = iter(_split_sentences(self._input_text))
+        pending: deque = deque()
+
+        def prefetch() -> None:
+            for sentence in islice(sentences, MAX_PREFETCH - len(pending)):
+                pending.append(
+                    asyncio.ensure_future(self._tts_instance._limited_synthesize(sentence))
+                )
+
         try:
-            # Get raw audio data from Sarvam TTS
-            request_id, pcm_data = await self._tts_instance._synthesize_raw_audio(self._input_text)
-
-            # Initialize the emitter with audio parameters
-            output_emitter.initialize(
-                request_id=request_id,
-                sample_rate=self._tts_instance._sample_rate,
-                num_channels=1,
-                mime_type="audio/pcm",
-            )
+            prefetch()
+            chunk_size = self._tts_instance._sample_rate * 2 * PUSH_CHUNK_MS // 1000
+            initialized = False
+            total = 0
+
+            while pending:
+                # Get raw audio data from Sarvam TTS, in sentence order
+                request_id, pcm_data = await pending.popleft()
+                prefetch()
+
+                if not initialized:
+                    # Initialize the emitter with audio parameters
+                    output_emitter.initialize(
+                        request_id=request_id,
+                        sample_rate=self._tts_instance._sample_rate,
+                        num_channels=1,
+                        mime_type="audio/pcm",
+                    )
+                    initialized = True
 
-            # Push the PCM audio data
-            output_emitter.push(pcm_data)
-            logger.debug(f"Pushed {len(pcm_data)} bytes of PCM audio to emitter")
+                # Push the PCM audio in short chunks sliced from the response view,
+                # so no full-size copy is made (the emitter only accepts bytes)
+                for start in range(0, len(pcm_data), chunk_size):
+                    output_emitter.push(bytes(pcm_data[start:start + chunk_size]))
+                total += len(pcm_data)
+            logger.debug("Pushed %d bytes of PCM audio to emitter", total)
 
             # Flush the buffer and signal end of input
             output_emitter.flush()
@@ -63,6 +174,13 @@ class SarvamChunkedStream(tts.ChunkedStream):
         except Exception as e:
             logger.error(f"Error in TTS stream: {e}", exc_info=True)
             raise
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                # Let cancellation finish and retrieve any errors from the
+                # prefetched requests so none go unreported as never retrieved
+                await asyncio.gather(*pending, return_exceptions=True)
 
 
 class SarvamTTS(tts.TTS):
@@ -106,11 +224,17 @@ class SarvamTTS(tts.TTS):
         self._api_url = api_url
         self._language = language
         self._speaker = speaker
-        self._pitch = max(-0.75, min(0.75, pitch))
-        self._pace = max(0.5, min(2.0, pace))
-        self._loudness = max(0.3, min(3.0, loudness))
+        self._pitch = _clamp(pitch, -0.75, 0.75)
+        self._pace = _clamp(pace, 0.5, 2.0)
+        self._loudness = _clamp(loudness, 0.3, 3.0)
         self._sample_rate = sample_rate
-        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Request parts that only change with the options are built once
+        self._headers = {
+            "Content-Type": "application/json",
+            "api-subscription-key": self._api_key,
+        }
+        self._payload_base = self._build_payload_base()
 
         logger.info(
             f"Initialized Sarvam TTS with speaker: {speaker}, "
@@ -118,10 +242,29 @@ class SarvamTTS(tts.TTS):
         )
 
     async def _ensure_session(self) -> aiohttp.ClientSession:
-        """Ensure aiohttp session is initialized."""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
+        """Get the shared aiohttp session (pooled with the other Sarvam client)."""
+        return get_shared_session()
+
+    async def aclose(self) -> None:
+        """Clean up resources. The shared session is closed at job shutdown."""
+
+    def _build_payload_base(self) -> dict:
+        """
+        Build the request payload fields shared by every synthesis call.
+
+        Returns:
+            Payload dict without the text field
+        """
+        return {
+            "target_language_code": self._language,
+            "speaker": self._speaker,
+            "pitch": self._pitch,
+            "pace": self._pace,
+            "loudness": self._loudness,
+            "speech_sample_rate": self._sample_rate,
+            "output_audio_codec": "wav",
+            "model": "bulbul:v2",
+        }
 
     def synthesize(
         self,
@@ -148,9 +291,11 @@ class SarvamTTS(tts.TTS):
             conn_options=conn_options,
         )
 
-    async def _synthesize_raw_audio(self, text: str) -> tuple[str, bytes]:
+    async def _limited_synthesize(self, text: str) -> tuple[str, memoryview]:
         """
-        Synthesize raw PCM audio from text using Sarvam AI.
+        Synthesize audio once a request slot is available.
+
+        The number of concurrent API calls is capped per process.
 
         Args:
             text: Text to convert to speech
@@ -158,70 +303,98 @@ class SarvamTTS(tts.TTS):
         Returns:
             Tuple of (request_id, pcm_data)
         """
-        try:
-            session = await self._ensure_session()
+        async with _get_request_semaphore():
+            return await self._synthesize_raw_audio(text)
 
-            # Prepare request
-            headers = {
-                "Content-Type": "application/json",
-                "api-subscription-key": self._api_key,
-            }
+    async def _post(self, payload: dict) -> Tuple[int, bytes]:
+        """
+        POST a synthesis request, over HTTP/2 when it is available.
 
+        Args:
+            payload: JSON request payload
+
+        Returns:
+            Tuple of (status_code, response_body)
+        """
+        client = get_h2_client()
+        if client is not None:
+            response = await client.post(self._api_url, headers=self._headers, json=payload)
+            return response.status_code, response.content
+
+        session = await self._ensure_session()
+        async with session.post(
+            self._api_url,
+            headers=self._headers,
+            json=payload,
+        ) as response:
+            return response.status, await response.read()
+
+    async def _synthesize_raw_audio(self, text: str) -> tuple[str, memoryview]:
+        """
+        Synthesize raw PCM audio from text using Sarvam AI.
+
+        Args:
+            text: Text to convert to speech
+
+        Returns:
+            Tuple of (request_id, pcm_data) where pcm_data is a view into the
+            decoded WAV response
+        """
+        # Max 1500 characters; only slice (and copy) when over the limit
+        text = text if len(text) <= 1500 else text[:1500]
+        if not text or text.isspace():
+            # Nothing to speak; skip the round-trip
+            return "sarvam-tts-empty", memoryview(b"")
+
+        try:
+            # Prepare request
             payload = {
-                "text": text[:1500],  # Max 1500 characters
-                "target_language_code": self._language,
-                "speaker": self._speaker,
-                "pitch": self._pitch,
-                "pace": self._pace,
-                "loudness": self._loudness,
-                "speech_sample_rate": self._sample_rate,
-                "output_audio_codec": "wav",
-                "model": "bulbul:v2",
+                **self._payload_base,
+                "text": text,
             }
 
             logger.debug(
-                f"Sending text to Sarvam TTS (length: {len(text)} chars, "
-                f"speaker: {self._speaker})"
+                "Sending text to Sarvam TTS (length: %d chars, speaker: %s)",
+                len(text),
+                self._speaker,
             )
 
             # Make API request
-            async with session.post(
-                self._api_url,
-                headers=headers,
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=30),
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Sarvam TTS API error: {response.status} - {error_text}"
-                    )
-                    raise Exception(f"Sarvam TTS API error: {response.status}")
-
-                result = await response.json()
-                request_id = result.get("request_id", "sarvam-tts")
-                logger.debug("Received TTS response from Sarvam AI")
-
-                # Extract and decode audio
-                if "audios" in result and len(result["audios"]) > 0:
-                    # Sarvam returns base64-encoded audio
-                    audio_base64 = result["audios"][0]
-                    audio_data = base64.b64decode(audio_base64)
-
-                    logger.info(
-                        f"Generated audio: {len(audio_data)} bytes, "
-                        f"sample_rate: {self._sample_rate}"
-                    )
-
-                    # For WAV format, skip the 44-byte header to get raw PCM
-                    if len(audio_data) > 44:
-                        pcm_data = audio_data[44:]  # Skip WAV header
-                        return request_id, pcm_data
-                    else:
-                        logger.warning("Received audio data is too small")
-                        return request_id, b""
-
-                return request_id, b""
+            status, body = await self._post(payload)
+            if status != 200:
+                error_text = body.decode("utf-8", errors="replace")
+                logger.error(f"Sarvam TTS API error: {status} - {error_text}")
+                raise Exception(f"Sarvam TTS API error: {status}")
+
+            result = json_loads(body)
+            request_id = result.get("request_id", "sarvam-tts")
+            logger.debug("Received TTS response from Sarvam AI")
+
+            # Extract and decode audio
+            if "audios" in result and len(result["audios"]) > 0:
+                # Sarvam returns base64-encoded audio; a2b_base64 reads the
+                # ASCII str in place instead of encoding it to bytes first
+                audio_base64 = result["audios"][0]
+                audio_data = binascii.a2b_base64(audio_base64)
+
+                logger.info(
+                    "Generated audio: %d bytes, sample_rate: %d",
+                    len(audio_data),
+                    self._sample_rate,
+                )
+
+                # Skip the WAV header (its size varies) without copying the PCM
+                data_offset, data_length = _find_wav_data(audio_data)
+                if data_length > 0:
+                    pcm_data = memoryview(audio_data)[
+                        data_offset:data_offset + data_length
+                    ]
+                    return request_id, pcm_data
+                else:
+                    logger.warning("Received audio data is too small")
+                    return request_id, memoryview(b"")
+
+            return request_id, memoryview(b"")
 
         except asyncio.TimeoutError:
             logger.error("Sarvam TTS request timed out")
@@ -230,11 +403,6 @@ class SarvamTTS(tts.TTS):
             logger.error(f"Error in Sarvam TTS synthesis: {e}", exc_info=True)
             raise
 
-    async def aclose(self) -> None:
-        """Clean up resources."""
-        if self._session and not self._session.closed:
-            await self._session.close()
-
     def update_options(
         self,
         *,
@@ -257,13 +425,15 @@ class SarvamTTS(tts.TTS):
             logger.info(f"Updated speaker to: {speaker}")
 
         if pitch is not None:
-            self._pitch = max(-0.75, min(0.75, pitch))
+            self._pitch = _clamp(pitch, -0.75, 0.75)
             logger.info(f"Updated pitch to: {self._pitch}")
 
         if pace is not None:
-            self._pace = max(0.5, min(2.0, pace))
+            self._pace = _clamp(pace, 0.5, 2.0)
             logger.info(f"Updated pace to: {self._pace}")
 
         if loudness is not None:
-            self._loudness = max(0.3, min(3.0, loudness))
+            self._loudness = _clamp(loudness, 0.3, 3.0)
             logger.info(f"Updated loudness to: {self._loudness}")
+
+        self._payload_base = self._build_payload_base()
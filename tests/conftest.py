@@ -0,0 +1,9 @@
+"""
+Shared pytest configuration.
+Provides placeholder API keys so settings load without a .env file.
+"""
+
+import os
+
+os.environ.setdefault("SARVAM_API_KEY", "test-sarvam-key")
+os.environ.setdefault("GEMINI_API_KEY", "test-gemini-key")
@@ -0,0 +1,79 @@
+"""
+Tests for converting LiveKit chat contexts to Gemini requests.
+"""
+
+from livekit.agents import llm
+
+from conversation_ai.conversation.manager import ConversationSession
+from conversation_ai.llm.gemini_llm import (
+    GeminiLLM,
+    GeminiLLMStream,
+    _build_contents,
+    _find_system_instruction,
+)
+
+
+def test_system_instruction_comes_from_chat_context():
+    chat_ctx = llm.ChatContext()
+    chat_ctx.add_message(role="system", content="Be brief.")
+    chat_ctx.add_message(role="user", content="Hi")
+
+    assert _find_system_instruction(chat_ctx) == "Be brief."
+    assert _build_contents(chat_ctx) == [{"role": "user", "parts": [{"text": "Hi"}]}]
+
+
+def test_system_instruction_follows_updates():
+    chat_ctx = llm.ChatContext()
+    chat_ctx.add_message(role="system", content="Be brief.")
+    chat_ctx.add_message(role="user", content="Hi")
+    chat_ctx.items[0] = llm.ChatMessage(role="system", content=["Be detailed."])
+
+    assert _find_system_instruction(chat_ctx) == "Be detailed."
+
+
+def test_missing_system_instruction():
+    chat_ctx = llm.ChatContext()
+    chat_ctx.add_message(role="user", content="Hi")
+    chat_ctx.add_message(role="assistant", content="Hello!")
+
+    assert _find_system_instruction(chat_ctx) is None
+    assert _build_contents(chat_ctx) == [
+        {"role": "user", "parts": [{"text": "Hi"}]},
+        {"role": "model", "parts": [{"text": "Hello!"}]},
+    ]
+
+
+def _stream(chat_ctx: llm.ChatContext, session) -> GeminiLLMStream:
+    """Build a stream for request building only, without starting it."""
+    gemini = GeminiLLM(client=object())
+    gemini.bind_session(session)
+    stream = GeminiLLMStream.__new__(GeminiLLMStream)
+    stream._llm = gemini
+    stream._chat_ctx = chat_ctx
+    stream._system_instruction = gemini._system_instruction
+    return stream
+
+
+def test_session_and_fallback_paths_send_same_instruction():
+    session = ConversationSession(session_id="test")
+    session.add_turn("user", "Hi")
+
+    chat_ctx = llm.ChatContext()
+    chat_ctx.add_message(role="system", content="Updated instructions.")
+    chat_ctx.add_message(role="user", content="Hi")
+
+    fast_contents, fast_instruction = _stream(chat_ctx, session)._build_contents()
+    slow_contents, slow_instruction = _stream(chat_ctx, None)._build_contents()
+
+    assert fast_contents == slow_contents
+    assert fast_instruction == slow_instruction == "Updated instructions."
+
+
+def test_captured_prompt_is_the_fallback_instruction():
+    chat_ctx = llm.ChatContext()
+    chat_ctx.add_message(role="user", content="Hi")
+
+    stream = _stream(chat_ctx, None)
+    _, instruction = stream._build_contents()
+
+    assert instruction == stream._system_instruction
@@ -0,0 +1,136 @@
+"""
+Tests for the Sarvam STT upload body and resampling.
+"""
+
+import struct
+from email.parser import BytesParser
+from email.policy import HTTP
+
+import numpy as np
+import pytest
+
+from conversation_ai.stt.sarvam_stt import SarvamSTT, _to_int16_pcm
+
+PCM = struct.pack('<8h', 0, 1, -1, 32767, -32768, 100, -100, 13)
+
+
+class _Writer:
+    """Collects the bytes written by a payload."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    async def write(self, chunk) -> None:
+        self.data += chunk
+
+
+def _parse(payload, body: bytes) -> dict:
+    """Parse a multipart body into {field name: part message}."""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {payload.content_type}\r\n\r\n".encode() + body
+    )
+    assert message.is_multipart()
+    return {
+        part.get_param("name", header="content-disposition"): part
+        for part in message.iter_parts()
+    }
+
+
+@pytest.mark.asyncio
+async def test_wav_upload_round_trips():
+    stt = SarvamSTT(api_key="key", language="hi-IN")
+    payload = stt._build_upload(memoryview(PCM), 16000, "ta-IN")
+    body = await payload.as_bytes()
+
+    assert payload.size == len(body)
+    parts = _parse(payload, body)
+    assert parts["language_code"].get_content() == "ta-IN"
+
+    file_part = parts["file"]
+    assert file_part.get_filename() == "audio.wav"
+    assert file_part.get_content_type() == "audio/wav"
+    wav = file_part.get_payload(decode=True)
+    assert wav[:4] == b"RIFF" and wav[8:12] == b"WAVE"
+    assert struct.unpack_from('<I', wav, 24)[0] == 16000
+    assert struct.unpack_from('<I', wav, 40)[0] == len(PCM)
+    assert wav[44:] == PCM
+
+
+@pytest.mark.asyncio
+async def test_raw_pcm_upload_round_trips():
+    stt = SarvamSTT(api_key="key", language="hi-IN", raw_pcm_upload=True)
+    payload = stt._build_upload(memoryview(PCM), 16000, "hi-IN")
+    body = await payload.as_bytes()
+
+    parts = _parse(payload, body)
+    assert parts["language_code"].get_content() == "hi-IN"
+
+    file_part = parts["file"]
+    assert file_part.get_filename() == "audio.pcm"
+    assert file_part.get_content_type() == "audio/l16"
+    assert file_part.get_param("rate") == "16000"
+    assert file_part.get_payload(decode=True) == PCM
+
+
+@pytest.mark.asyncio
+async def test_language_part_follows_overrides():
+    stt = SarvamSTT(api_key="key", language="hi-IN")
+    for language in ("en-IN", "hi-IN", "en-IN"):
+        payload = stt._build_upload(memoryview(PCM), 16000, language)
+        parts = _parse(payload, await payload.as_bytes())
+        assert parts["language_code"].get_content() == language
+
+
+@pytest.mark.asyncio
+async def test_write_matches_as_bytes():
+    stt = SarvamSTT(api_key="key")
+    payload = stt._build_upload(memoryview(PCM), 16000, "hi-IN")
+    writer = _Writer()
+    await payload.write(writer)
+    assert bytes(writer.data) == await payload.as_bytes()
+
+
+@pytest.mark.asyncio
+async def test_write_with_length_truncates_across_segments():
+    stt = SarvamSTT(api_key="key")
+    payload = stt._build_upload(memoryview(PCM), 16000, "hi-IN")
+    body = await payload.as_bytes()
+    head_size = len(body) - len(PCM) - len(stt._multipart_tail)
+
+    for length in (0, 1, head_size, head_size + 3, len(body) - 1, len(body), None):
+        writer = _Writer()
+        await payload.write_with_length(writer, length)
+        assert bytes(writer.data) == (body if length is None else body[:length])
+
+
+def _tone_level(samples: np.ndarray, rate: int, freq: float) -> float:
+    """Amplitude of a pure tone in the given samples."""
+    t = np.arange(len(samples)) / rate
+    return 2 * abs(np.mean(samples * np.exp(-2j * np.pi * freq * t)))
+
+
+def test_downsampling_keeps_passband():
+    t = np.arange(4800) / 48000
+    tone = (np.sin(2 * np.pi * 1000 * t) * 10000).astype('<i2')
+    out = _to_int16_pcm(tone, 48000, 16000)
+
+    assert out.dtype == np.dtype('<i2') and len(out) == 1600
+    assert _tone_level(out[200:-200], 16000, 1000) == pytest.approx(10000, rel=0.05)
+
+
+def test_downsampling_does_not_alias():
+    # 20 kHz at 48 kHz would fold to 4 kHz at 16 kHz without filtering
+    t = np.arange(4800) / 48000
+    tone = (np.sin(2 * np.pi * 20000 * t) * 10000).astype('<i2')
+    out = _to_int16_pcm(tone, 48000, 16000)
+
+    assert _tone_level(out[200:-200], 16000, 4000) < 100
+
+
+@pytest.mark.parametrize("length", [1, 10, 50, 96, 97, 500])
+@pytest.mark.parametrize("dst_rate", [16000, 8000])
+def test_downsampling_short_buffers_keep_length(length, dst_rate):
+    samples = np.full(length, 1000, dtype='<i2')
+    out = _to_int16_pcm(samples, 48000, dst_rate)
+
+    assert len(out) == round(length * dst_rate / 48000)
@@ -0,0 +1,22 @@
+"""
+Tests for Sarvam TTS sentence splitting.
+"""
+
+import pytest
+
+from conversation_ai.tts.sarvam_tts import _split_sentences
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Hello there. How are you?", ["Hello there.", "How are you?"]),
+        ('He said "Hi." Then left.', ['He said "Hi."', "Then left."]),
+        ("(See above.) Next! Done", ["(See above.)", "Next!", "Done"]),
+        ("नमस्ते। आप कैसे हैं?", ["नमस्ते।", "आप कैसे हैं?"]),
+        ("Pi is 3.14 roughly.", ["Pi is 3.14 roughly."]),
+        ("", [""]),
+    ],
+)
+def test_split_sentences(text, expected):
+    assert _split_sentences(text) == expected